@@ -0,0 +1,103 @@
+import com.deepagents.backends.impl.*;
+import com.deepagents.backends.protocol.*;
+import java.nio.file.*;
+import java.util.*;
+
+public class BackendDemo {
+    public static void main(String[] args) throws Exception {
+        // StateBackend Demo
+        System.out.println("\n1. StateBackend (In-Memory)");
+        System.out.println("-".repeat(40));
+        StateBackend backend = new StateBackend();
+
+        // Write
+        WriteResult result = backend.write("/notes.txt", "Hello from Java!\nLine 2\nLine 3");
+        System.out.println("✓ Write: path=" + result.getPath() + ", error=" + result.getError());
+
+        // Read
+        String content = backend.read("/notes.txt", 0, 10);
+        System.out.println("✓ Read (first 3 lines):");
+        String[] lines = content.split("\n");
+        for (int i = 0; i < Math.min(3, lines.length); i++) {
+            System.out.println("  " + lines[i]);
+        }
+
+        // Edit
+        EditResult editResult = backend.edit("/notes.txt", "Java", "Java Backend");
+        System.out.println("✓ Edit: occurrences=" + editResult.getOccurrences() +
+                          ", success=" + editResult.isSuccess());
+
+        // List
+        backend.write("/data.txt", "data");
+        backend.write("/folder/file.txt", "nested");
+        List<FileInfo> infos = backend.lsInfo("/");
+        System.out.println("✓ List directory: " + infos.size() + " items");
+        for (FileInfo info : infos) {
+            System.out.println("  - " + info.getPath() +
+                             (info.isDir() ? " (dir)" : ""));
+        }
+
+        // Grep
+        @SuppressWarnings("unchecked")
+        List<GrepMatch> matches = (List<GrepMatch>) backend.grepRaw("Java", "/", null);
+        System.out.println("✓ Grep 'Java': " + matches.size() + " matches");
+        if (!matches.isEmpty()) {
+            GrepMatch m = matches.get(0);
+            System.out.println("  - " + m.getPath() + ":" + m.getLine() + " " +
+                             m.getText().substring(0, Math.min(50, m.getText().length())));
+        }
+
+        // FilesystemBackend Demo
+        System.out.println("\n2. FilesystemBackend");
+        System.out.println("-".repeat(40));
+        Path tmpDir = Files.createTempDirectory("backend-demo");
+        FilesystemBackend fsBackend = new FilesystemBackend(tmpDir, true, 10);
+
+        // Write
+        result = fsBackend.write("/test.txt", "Filesystem test\nMultiple lines");
+        System.out.println("✓ Write to filesystem: success=" + result.isSuccess());
+        System.out.println("  Real path: " + tmpDir.resolve("test.txt"));
+
+        // Read
+        content = fsBackend.read("/test.txt");
+        lines = content.split("\n");
+        System.out.println("✓ Read from filesystem:");
+        for (int i = 0; i < Math.min(2, lines.length); i++) {
+            System.out.println("  " + lines[i]);
+        }
+
+        // Edit
+        editResult = fsBackend.edit("/test.txt", "test", "example");
+        System.out.println("✓ Edit filesystem file: occurrences=" + editResult.getOccurrences());
+
+        // Cleanup
+        Files.walk(tmpDir)
+             .sorted(Comparator.reverseOrder())
+             .forEach(p -> { try { Files.delete(p); } catch(Exception e) {} });
+
+        // CompositeBackend Demo
+        System.out.println("\n3. CompositeBackend (Routing)");
+        System.out.println("-".repeat(40));
+        StateBackend defaultBackend = new StateBackend();
+        StateBackend memoryBackend = new StateBackend();
+
+        Map<String, BackendProtocol> routes = new HashMap<>();
+        routes.put("/memory/", memoryBackend);
+        CompositeBackend composite = new CompositeBackend(defaultBackend, routes);
+
+        // Write to different backends
+        composite.write("/default.txt", "In default backend");
+        composite.write("/memory/note.txt", "In memory backend");
+
+        System.out.println("✓ Write to default backend: /default.txt");
+        System.out.println("✓ Write to routed backend: /memory/note.txt");
+
+        // List root shows both
+        infos = composite.lsInfo("/");
+        System.out.println("✓ List root: " + infos.size() + " items");
+        for (FileInfo info : infos) {
+            System.out.println("  - " + info.getPath() +
+                             (info.isDir() ? " (dir)" : ""));
+        }
+    }
+}
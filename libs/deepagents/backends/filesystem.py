@@ -7,22 +7,127 @@ Security and search upgrades:
   and optional glob include filtering, while preserving virtual path behavior
 """
 
-import json
+import fnmatch
+import functools
+import math
 import os
 import re
+import stat
 import subprocess
-from datetime import datetime
+import time
+from collections.abc import Callable, Iterator
+from operator import itemgetter
 from pathlib import Path
+from typing import Any, TextIO
 
 import wcmatch.glob as wcglob
 
 from deepagents.backends.protocol import BackendProtocol, EditResult, FileInfo, GrepMatch, WriteResult
 from deepagents.backends.utils import (
-    check_empty_content,
+    EMPTY_CONTENT_WARNING,
+    _required_literal,
+    _search_text,
     format_content_with_line_numbers,
+    is_literal_pattern,
     perform_string_replacement,
 )
 
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError: type[ValueError] = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+
+_MICROS_PER_SECOND = 1_000_000
+# Files larger than this are read line by line and only up to the requested
+# window; smaller ones are cheaper to read and split in one go
+_STREAM_READ_MIN_BYTES = 256 * 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_local_seconds(seconds: int) -> str:
+    t = time.localtime(seconds)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+
+def _format_mtime(mtime: float) -> str:
+    """Format a stat mtime exactly like ``datetime.fromtimestamp(mtime).isoformat()``.
+
+    Entries in one listing tend to share the same second, so the local-time
+    conversion and formatting of the whole-second part is cached and only the
+    microseconds are formatted per call. Rounding matches datetime's
+    round-half-even handling of the fractional second.
+    """
+    frac, whole = math.modf(mtime)
+    micros = round(frac * _MICROS_PER_SECOND)
+    if micros >= _MICROS_PER_SECOND:
+        whole += 1
+        micros -= _MICROS_PER_SECOND
+    elif micros < 0:
+        whole -= 1
+        micros += _MICROS_PER_SECOND
+    base = _format_local_seconds(int(whole))
+    return f"{base}.{micros:06d}" if micros else base
+
+
+def _read_line_window(f: TextIO, offset: int, limit: int) -> tuple[list[str], int, bool]:
+    """Collect lines [offset, offset + limit) of a text file without reading all of it.
+
+    Lines are split exactly as ``str.splitlines()`` splits the whole content.
+    Reading stops once the window is full and some non-whitespace text has been
+    seen; otherwise the file is read to the end so the caller can still report
+    an empty file or an out-of-range offset with the total line count.
+
+    Returns:
+        Tuple of (selected lines, number of lines read, whether any non-whitespace text was seen).
+    """
+    end = offset + limit
+    selected: list[str] = []
+    num_lines = 0
+    has_text = False
+    for physical_line in f:
+        if not has_text and not physical_line.isspace():
+            has_text = True
+        for line in physical_line.splitlines():
+            if offset <= num_lines < end:
+                selected.append(line)
+            num_lines += 1
+        if has_text and num_lines >= end and num_lines > offset:
+            break
+    return selected, num_lines, has_text
+
+
+def _walk_files(root: str) -> Iterator[os.DirEntry[str]]:
+    """Yield a DirEntry for every file under root, recursively.
+
+    Mirrors Path.rglob("*") filtered to files: hidden entries are included,
+    symlinks to files are yielded, and symlinked directories are not descended
+    into. Unreadable directories are skipped. Entry types come from readdir, so
+    no Path objects or extra stat calls are needed to classify entries.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+
 
 class FilesystemBackend(BackendProtocol):
     """Backend that reads and writes files directly from the filesystem.
@@ -48,6 +153,10 @@ class FilesystemBackend(BackendProtocol):
         self.cwd = Path(root_dir).resolve() if root_dir else Path.cwd()
         self.virtual_mode = virtual_mode
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        # cwd is fixed for the backend's lifetime, so precompute the prefixes
+        # used to turn absolute paths into virtual ones
+        self._cwd_str = str(self.cwd)
+        self._cwd_prefix = self._cwd_str if self._cwd_str.endswith("/") else self._cwd_str + "/"
 
     def _resolve_path(self, key: str) -> Path:
         """Resolve a file path with security checks.
@@ -67,17 +176,36 @@ class FilesystemBackend(BackendProtocol):
             vpath = key if key.startswith("/") else "/" + key
             if ".." in vpath or vpath.startswith("~"):
                 raise ValueError("Path traversal not allowed")
-            full = (self.cwd / vpath.lstrip("/")).resolve()
-            try:
-                full.relative_to(self.cwd)
-            except ValueError:
-                raise ValueError(f"Path:{full} outside root directory: {self.cwd}") from None
-            return full
+            # realpath still resolves symlinks; containment is then a plain
+            # prefix check against the cached cwd string
+            full = os.path.realpath(os.path.join(self._cwd_str, vpath.lstrip("/")))
+            if full != self._cwd_str and not full.startswith(self._cwd_prefix):
+                raise ValueError(f"Path:{full} outside root directory: {self.cwd}")
+            return Path(full)
+
+        if os.path.isabs(key):
+            return Path(key)
+        return Path(os.path.realpath(os.path.join(self._cwd_str, key)))
 
-        path = Path(key)
-        if path.is_absolute():
-            return path
-        return (self.cwd / path).resolve()
+    def _to_virtual_path(self, abs_path: str) -> str:
+        """Convert an absolute filesystem path under cwd to a virtual path.
+
+        Args:
+            abs_path: Absolute path as a string.
+
+        Returns:
+            Path relative to cwd with a leading "/", or abs_path prefixed with
+            "/" if it lies outside cwd.
+        """
+        if abs_path.startswith(self._cwd_prefix):
+            relative_path = abs_path[len(self._cwd_prefix) :]
+        elif abs_path.startswith(self._cwd_str):
+            # Handle case where cwd doesn't end with /
+            relative_path = abs_path[len(self._cwd_str) :].lstrip("/")
+        else:
+            # Path is outside cwd, return as-is
+            relative_path = abs_path
+        return "/" + relative_path
 
     def ls_info(self, path: str) -> list[FileInfo]:
         """List files and directories in the specified directory (non-recursive).
@@ -90,99 +218,48 @@ class FilesystemBackend(BackendProtocol):
             Directories have a trailing / in their path and is_dir=True.
         """
         dir_path = self._resolve_path(path)
-        if not dir_path.exists() or not dir_path.is_dir():
+        if not dir_path.is_dir():
             return []
 
         results: list[FileInfo] = []
 
-        # Convert cwd to string for comparison
-        cwd_str = str(self.cwd)
-        if not cwd_str.endswith("/"):
-            cwd_str += "/"
-
-        # List only direct children (non-recursive)
+        # List only direct children (non-recursive). scandir reuses the entry
+        # type from readdir and caches stat(), so each child costs one syscall.
         try:
-            for child_path in dir_path.iterdir():
-                try:
-                    is_file = child_path.is_file()
-                    is_dir = child_path.is_dir()
-                except OSError:
-                    continue
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        is_file = entry.is_file()
+                        is_dir = not is_file and entry.is_dir()
+                    except OSError:
+                        continue
+                    if not is_file and not is_dir:
+                        continue
 
-                abs_path = str(child_path)
-
-                if not self.virtual_mode:
-                    # Non-virtual mode: use absolute paths
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path + "/", "is_dir": True})
-                else:
-                    # Virtual mode: strip cwd prefix
-                    if abs_path.startswith(cwd_str):
-                        relative_path = abs_path[len(cwd_str) :]
-                    elif abs_path.startswith(str(self.cwd)):
-                        # Handle case where cwd doesn't end with /
-                        relative_path = abs_path[len(str(self.cwd)) :].lstrip("/")
-                    else:
-                        # Path is outside cwd, return as-is or skip
-                        relative_path = abs_path
-
-                    virt_path = "/" + relative_path
-
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path + "/", "is_dir": True})
+                    # Virtual mode: strip cwd prefix; otherwise use absolute paths
+                    entry_path = self._to_virtual_path(entry.path) if self.virtual_mode else entry.path
+
+                    if is_dir:
+                        entry_path += "/"
+
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        results.append({"path": entry_path, "is_dir": is_dir})
+                        continue
+                    results.append(
+                        {
+                            "path": entry_path,
+                            "is_dir": is_dir,
+                            "size": 0 if is_dir else int(st.st_size),
+                            "modified_at": _format_mtime(st.st_mtime),
+                        }
+                    )
         except (OSError, PermissionError):
             pass
 
         # Keep deterministic order by path
-        results.sort(key=lambda x: x.get("path", ""))
+        results.sort(key=itemgetter("path"))
         return results
 
     # Removed legacy ls() convenience to keep lean surface
@@ -203,33 +280,40 @@ class FilesystemBackend(BackendProtocol):
         """
         resolved_path = self._resolve_path(file_path)
 
-        if not resolved_path.exists() or not resolved_path.is_file():
+        # One stat answers both "exists" and "is a regular file", and its size
+        # picks the read strategy. A size of 0 is not taken to mean empty:
+        # procfs and similar files report 0 but have content.
+        try:
+            st: os.stat_result | None = os.stat(resolved_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             return f"Error: File '{file_path}' not found"
 
         try:
             # Open with O_NOFOLLOW where available to avoid symlink traversal
             try:
                 fd = os.open(resolved_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
-                with os.fdopen(fd, "r", encoding="utf-8") as f:
-                    content = f.read()
+                f = os.fdopen(fd, "r", encoding="utf-8")
             except OSError:
                 # Fallback to normal open if O_NOFOLLOW unsupported or fails
-                with open(resolved_path, encoding="utf-8") as f:
+                f = open(resolved_path, encoding="utf-8")  # noqa: SIM115
+            with f:
+                if st.st_size > _STREAM_READ_MIN_BYTES:
+                    selected_lines, num_lines, has_text = _read_line_window(f, offset, limit)
+                else:
                     content = f.read()
+                    lines = content.splitlines()
+                    selected_lines, num_lines = lines[offset : offset + limit], len(lines)
+                    has_text = bool(content) and not content.isspace()
 
-            empty_msg = check_empty_content(content)
-            if empty_msg:
-                return empty_msg
+            if not has_text:
+                return EMPTY_CONTENT_WARNING
 
-            lines = content.splitlines()
-            start_idx = offset
-            end_idx = min(start_idx + limit, len(lines))
+            if offset >= num_lines:
+                return f"Error: Line offset {offset} exceeds file length ({num_lines} lines)"
 
-            if start_idx >= len(lines):
-                return f"Error: Line offset {offset} exceeds file length ({len(lines)} lines)"
-
-            selected_lines = lines[start_idx:end_idx]
-            return format_content_with_line_numbers(selected_lines, start_line=start_idx + 1)
+            return format_content_with_line_numbers(selected_lines, start_line=offset + 1)
         except (OSError, UnicodeDecodeError) as e:
             return f"Error reading file '{file_path}': {e}"
 
@@ -247,6 +331,11 @@ class FilesystemBackend(BackendProtocol):
             return WriteResult(error=f"Cannot write to {file_path} because it already exists. Read and then make an edit, or write to a new path.")
 
         try:
+            # Encode once up front and write the bytes directly, rather than
+            # going through a text wrapper that encodes into its own buffer.
+            # Unencodable content also fails here, before the file is created.
+            data = content.encode("utf-8")
+
             # Create parent directories if needed
             resolved_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -255,8 +344,8 @@ class FilesystemBackend(BackendProtocol):
             if hasattr(os, "O_NOFOLLOW"):
                 flags |= os.O_NOFOLLOW
             fd = os.open(resolved_path, flags, 0o644)
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(content)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
 
             return WriteResult(path=file_path, files_update=None)
         except (OSError, UnicodeEncodeError) as e:
@@ -274,7 +363,12 @@ class FilesystemBackend(BackendProtocol):
         """
         resolved_path = self._resolve_path(file_path)
 
-        if not resolved_path.exists() or not resolved_path.is_file():
+        # One stat answers both "exists" and "is a regular file"
+        try:
+            is_file = stat.S_ISREG(os.stat(resolved_path).st_mode)
+        except OSError:
+            is_file = False
+        if not is_file:
             return EditResult(error=f"Error: File '{file_path}' not found")
 
         try:
@@ -293,14 +387,15 @@ class FilesystemBackend(BackendProtocol):
                 return EditResult(error=result)
 
             new_content, occurrences = result
+            data = new_content.encode("utf-8")
 
             # Write securely
             flags = os.O_WRONLY | os.O_TRUNC
             if hasattr(os, "O_NOFOLLOW"):
                 flags |= os.O_NOFOLLOW
             fd = os.open(resolved_path, flags)
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
 
             return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
         except (OSError, UnicodeDecodeError, UnicodeEncodeError) as e:
@@ -314,9 +409,9 @@ class FilesystemBackend(BackendProtocol):
         path: str | None = None,
         glob: str | None = None,
     ) -> list[GrepMatch] | str:
-        # Validate regex
+        # Validate regex; the compiled pattern is reused by the Python fallback
         try:
-            re.compile(pattern)
+            regex = re.compile(pattern)
         except re.error as e:
             return f"Invalid regex pattern: {e}"
 
@@ -332,7 +427,7 @@ class FilesystemBackend(BackendProtocol):
         # Try ripgrep first
         results = self._ripgrep_search(pattern, base_full, glob)
         if results is None:
-            results = self._python_search(pattern, base_full, glob)
+            results = self._python_search(regex, base_full, glob)
 
         matches: list[GrepMatch] = []
         for fpath, items in results.items():
@@ -341,7 +436,11 @@ class FilesystemBackend(BackendProtocol):
         return matches
 
     def _ripgrep_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]] | None:
-        cmd = ["rg", "--json"]
+        # Skip oversized files in rg itself, matching the Python fallback's limit
+        cmd = ["rg", "--json", "--max-filesize", str(self.max_file_size_bytes)]
+        if is_literal_pattern(pattern):
+            # Fixed-string mode lets rg skip regex compilation and use its literal searcher
+            cmd.append("--fixed-strings")
         if include_glob:
             cmd.extend(["--glob", include_glob])
         cmd.extend(["--", pattern, str(base_full)])
@@ -350,7 +449,6 @@ class FilesystemBackend(BackendProtocol):
             proc = subprocess.run(  # noqa: S603
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=30,
                 check=False,
             )
@@ -358,10 +456,12 @@ class FilesystemBackend(BackendProtocol):
             return None
 
         results: dict[str, list[tuple[int, str]]] = {}
+        # rg emits one JSON object per line; decode bytes directly so orjson can
+        # skip the intermediate str when available.
         for line in proc.stdout.splitlines():
             try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
+                data = _json_loads(line)
+            except _JSONDecodeError:
                 continue
             if data.get("type") != "match":
                 continue
@@ -385,39 +485,43 @@ class FilesystemBackend(BackendProtocol):
 
         return results
 
-    def _python_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]]:
-        try:
-            regex = re.compile(pattern)
-        except re.error:
-            return {}
+    def _python_search(self, regex: re.Pattern[str], base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]]:
+        # Files that lack a substring every match needs can skip the line scan
+        required = _required_literal(regex)
+
+        # Compile the include glob once instead of re-parsing it for every file
+        include = wcglob.compile(include_glob, flags=wcglob.BRACE) if include_glob else None
 
         results: dict[str, list[tuple[int, str]]] = {}
         root = base_full if base_full.is_dir() else base_full.parent
 
-        for fp in root.rglob("*"):
-            if not fp.is_file():
-                continue
-            if include_glob and not wcglob.globmatch(fp.name, include_glob, flags=wcglob.BRACE):
+        for entry in _walk_files(str(root)):
+            # Filter on the name before touching the file
+            if include is not None and not include.match(entry.name):
                 continue
             try:
-                if fp.stat().st_size > self.max_file_size_bytes:
+                if entry.stat().st_size > self.max_file_size_bytes:
                     continue
             except OSError:
                 continue
             try:
-                content = fp.read_text()
+                with open(entry.path) as f:
+                    content = f.read()
             except (UnicodeDecodeError, PermissionError, OSError):
                 continue
-            for line_num, line in enumerate(content.splitlines(), 1):
-                if regex.search(line):
-                    if self.virtual_mode:
-                        try:
-                            virt_path = "/" + str(fp.resolve().relative_to(self.cwd))
-                        except Exception:
-                            continue
-                    else:
-                        virt_path = str(fp)
-                    results.setdefault(virt_path, []).append((line_num, line))
+            if required is not None and required not in content:
+                continue
+            hits = _search_text(regex, content)
+            if not hits:
+                continue
+            if self.virtual_mode:
+                real_path = os.path.realpath(entry.path)
+                if not real_path.startswith(self._cwd_prefix):
+                    continue
+                virt_path = "/" + real_path[len(self._cwd_prefix) :]
+            else:
+                virt_path = entry.path
+            results.setdefault(virt_path, []).extend(hits)
 
         return results
 
@@ -431,53 +535,34 @@ class FilesystemBackend(BackendProtocol):
 
         results: list[FileInfo] = []
         try:
-            # Use recursive globbing to match files in subdirectories as tests expect
-            for matched_path in search_path.rglob(pattern):
+            if "/" not in pattern and "**" not in pattern and pattern not in ("", ".", ".."):
+                # A pure filename pattern matches by name at any depth, so walk
+                # the tree once with scandir and test names against a regex
+                # translated the same way pathlib does, skipping Path objects
+                name_match = re.compile(fnmatch.translate(pattern)).match
+                matches: Iterator[str] = (entry.path for entry in _walk_files(str(search_path)) if name_match(entry.name))
+            else:
+                # Use recursive globbing to match files in subdirectories as tests expect
+                matches = (str(p) for p in search_path.rglob(pattern))
+            for abs_path in matches:
+                # A single stat() answers both "is it a regular file" and the
+                # size/mtime metadata, instead of is_file() followed by stat()
                 try:
-                    is_file = matched_path.is_file()
+                    st = os.stat(abs_path)
                 except OSError:
                     continue
-                if not is_file:
+                if not stat.S_ISREG(st.st_mode):
                     continue
-                abs_path = str(matched_path)
-                if not self.virtual_mode:
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": abs_path,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": abs_path, "is_dir": False})
-                else:
-                    cwd_str = str(self.cwd)
-                    if not cwd_str.endswith("/"):
-                        cwd_str += "/"
-                    if abs_path.startswith(cwd_str):
-                        relative_path = abs_path[len(cwd_str) :]
-                    elif abs_path.startswith(str(self.cwd)):
-                        relative_path = abs_path[len(str(self.cwd)) :].lstrip("/")
-                    else:
-                        relative_path = abs_path
-                    virt = "/" + relative_path
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": virt,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": virt, "is_dir": False})
+                results.append(
+                    {
+                        "path": self._to_virtual_path(abs_path) if self.virtual_mode else abs_path,
+                        "is_dir": False,
+                        "size": int(st.st_size),
+                        "modified_at": _format_mtime(st.st_mtime),
+                    }
+                )
         except (OSError, ValueError):
             pass
 
-        results.sort(key=lambda x: x.get("path", ""))
+        results.sort(key=itemgetter("path"))
         return results
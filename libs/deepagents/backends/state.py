@@ -1,5 +1,6 @@
 """StateBackend: Store files in LangGraph agent state (ephemeral)."""
 
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 from deepagents.backends.protocol import BackendProtocol, EditResult, FileInfo, GrepMatch, WriteResult
@@ -87,7 +88,7 @@ class StateBackend(BackendProtocol):
                 }
             )
 
-        infos.sort(key=lambda x: x.get("path", ""))
+        infos.sort(key=itemgetter("path"))
         return infos
 
     # Removed legacy ls() convenience to keep lean surface
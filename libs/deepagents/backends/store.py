@@ -1,5 +1,6 @@
 """StoreBackend: Adapter for LangGraph's BaseStore (persistent, cross-thread)."""
 
+from operator import itemgetter
 from typing import Any
 
 from langgraph.config import get_config
@@ -237,7 +238,7 @@ class StoreBackend(BackendProtocol):
                 }
             )
 
-        infos.sort(key=lambda x: x.get("path", ""))
+        infos.sort(key=itemgetter("path"))
         return infos
 
     # Removed legacy ls() convenience to keep lean surface
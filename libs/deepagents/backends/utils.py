@@ -5,6 +5,7 @@ helpers used by backends and the composite router. Structured helpers
 enable composition without fragile string parsing.
 """
 
+import functools
 import re
 from datetime import UTC, datetime
 from pathlib import Path
@@ -15,12 +16,36 @@ import wcmatch.glob as wcglob
 from deepagents.backends.protocol import FileInfo as _FileInfo
 from deepagents.backends.protocol import GrepMatch as _GrepMatch
 
+# re._parser and re._constants are private and may move or change between
+# Python versions. Grep only uses them to pick faster search strategies, so
+# when they are unavailable it falls back to the plain per-line search.
+try:
+    import re._constants as _re_constants
+    import re._parser as _re_parser
+
+    # Character classes that never match a newline
+    _LINE_LOCAL_CATEGORIES = frozenset({_re_constants.CATEGORY_DIGIT, _re_constants.CATEGORY_WORD, _re_constants.CATEGORY_NOT_SPACE})
+except (ImportError, AttributeError):
+    _HAS_RE_INTERNALS = False
+else:
+    _HAS_RE_INTERNALS = True
+
 EMPTY_CONTENT_WARNING = "System reminder: File exists but has empty contents"
 MAX_LINE_LENGTH = 10000
 LINE_NUMBER_WIDTH = 6
 TOOL_RESULT_TOKEN_LIMIT = 20000  # Same threshold as eviction
 TRUNCATION_GUIDANCE = "... [results truncated, try being more specific with your parameters]"
 
+# Characters that give a pattern regex meaning; patterns without them match literally.
+_REGEX_METACHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+# Line boundaries that str.splitlines() honours besides "\n"
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_NEWLINE = ord("\n")
+# Whole-text search switches to per-line checks once at least this many hits
+# were found and they cover more than one in every _DENSE_HITS_RATIO lines
+_DENSE_HITS_MIN = 16
+_DENSE_HITS_RATIO = 4
+
 # Re-export protocol types for backwards compatibility
 FileInfo = _FileInfo
 GrepMatch = _GrepMatch
@@ -35,6 +60,15 @@ def sanitize_tool_call_id(tool_call_id: str) -> str:
     return sanitized
 
 
+def is_literal_pattern(pattern: str) -> bool:
+    """Return True if a regex pattern contains no metacharacters.
+
+    Such patterns match exactly their own text, so searches can use plain
+    substring matching instead of the regex engine.
+    """
+    return _REGEX_METACHARACTERS.search(pattern) is None
+
+
 def format_content_with_line_numbers(
     content: str | list[str],
     start_line: int = 1,
@@ -195,7 +229,23 @@ def perform_string_replacement(
     Returns:
         Tuple of (new_content, occurrences) on success, or error message string
     """
-    occurrences = content.count(old_string)
+    if replace_all or not old_string:
+        new_content = content.replace(old_string, new_string)
+        if len(new_string) != len(old_string):
+            # Every replacement changes the length by the same amount, which
+            # gives the count without a second pass over content
+            occurrences = (len(new_content) - len(content)) // (len(new_string) - len(old_string))
+        else:
+            occurrences = content.count(old_string)
+    else:
+        # A single replacement only needs the first two occurrences located,
+        # and splices new_string in without a separate replace pass
+        idx = content.find(old_string)
+        end = idx + len(old_string)
+        if idx != -1 and content.find(old_string, end) == -1:
+            return content[:idx] + new_string + content[end:], 1
+        # Not found, or ambiguous: count for the error message below
+        occurrences = content.count(old_string)
 
     if occurrences == 0:
         return f"Error: String not found in file: '{old_string}'"
@@ -203,7 +253,6 @@ def perform_string_replacement(
     if occurrences > 1 and not replace_all:
         return f"Error: String '{old_string}' appears {occurrences} times in file. Use replace_all=True to replace all instances, or provide a more specific string with surrounding context."
 
-    new_content = content.replace(old_string, new_string)
     return new_content, occurrences
 
 
@@ -280,13 +329,15 @@ def _glob_search_files(
     # - Use "**" explicitly for recursive matching.
     effective_pattern = pattern
 
+    glob_matcher = wcglob.compile(effective_pattern, flags=wcglob.BRACE | wcglob.GLOBSTAR)
+
     matches = []
     for file_path, file_data in filtered.items():
         relative = file_path[len(normalized_path) :].lstrip("/")
         if not relative:
             relative = file_path.split("/")[-1]
 
-        if wcglob.globmatch(relative, effective_pattern, flags=wcglob.BRACE | wcglob.GLOBSTAR):
+        if glob_matcher.match(relative):
             matches.append((file_path, file_data["modified_at"]))
 
     matches.sort(key=lambda x: x[1], reverse=True)
@@ -326,6 +377,197 @@ def _format_grep_results(
     return "\n".join(lines)
 
 
+def _literal_text(regex: re.Pattern[str]) -> str | None:
+    """Return the text a compiled pattern matches verbatim, or None.
+
+    Only patterns without metacharacters qualify, and only when compiled
+    without flags such as IGNORECASE that change what the text matches.
+    """
+    if regex.flags & ~re.UNICODE or not is_literal_pattern(regex.pattern):
+        return None
+    return regex.pattern
+
+
+def _search_lines(regex: re.Pattern[str], lines: list[str], start_line: int = 1) -> list[tuple[int, str]]:
+    """Return (line_num, line) pairs for lines matching a compiled pattern.
+
+    Literal patterns are matched with substring search, which avoids a call
+    into the regex engine for every line. Lines are numbered from start_line.
+    """
+    literal = _literal_text(regex)
+    if literal is not None:
+        return [(line_num, line) for line_num, line in enumerate(lines, start_line) if literal in line]
+    return [(line_num, line) for line_num, line in enumerate(lines, start_line) if regex.search(line)]
+
+
+def _is_line_local(items: "_re_parser.SubPattern", flags: int) -> bool:  # noqa: PLR0911, PLR0912
+    r"""Return True if parsed regex items can only ever match within one line.
+
+    Such patterns never consume a newline, and use no assertion that could see
+    past the line they are matching in. Searching them over whole text with
+    MULTILINE set finds exactly the matches a per-line search would: ``^``,
+    ``$`` and ``\b`` see a newline at line edges just as they see the edge of
+    a lone line. Anything unrecognised is treated as not line-local.
+    """
+    c = _re_constants
+    for op, av in items:
+        if op is c.LITERAL:
+            if av == _NEWLINE:
+                return False
+        elif op is c.NOT_LITERAL:
+            if av != _NEWLINE:
+                return False
+        elif op is c.ANY:
+            if flags & re.DOTALL:
+                return False
+        elif op is c.IN:
+            for set_op, set_av in av:
+                if set_op is c.LITERAL:
+                    safe = set_av != _NEWLINE
+                elif set_op is c.RANGE:
+                    safe = not set_av[0] <= _NEWLINE <= set_av[1]
+                elif set_op is c.CATEGORY:
+                    safe = set_av in _LINE_LOCAL_CATEGORIES
+                else:
+                    # NEGATE: a negated set matches newlines unless it lists them
+                    safe = False
+                if not safe:
+                    return False
+        elif op is c.AT:
+            # \B never matches in an empty string, but does between two newlines
+            if av in (c.AT_BEGINNING_STRING, c.AT_END_STRING, c.AT_NON_BOUNDARY):
+                return False
+        elif op is c.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            if del_flags & re.MULTILINE or not _is_line_local(sub, (flags | add_flags) & ~del_flags):
+                return False
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT, c.POSSESSIVE_REPEAT):
+            if not _is_line_local(av[2], flags):
+                return False
+        elif op is c.ATOMIC_GROUP:
+            if not _is_line_local(av, flags):
+                return False
+        elif op is c.BRANCH:
+            if not all(_is_line_local(branch, flags) for branch in av[1]):
+                return False
+        elif op is c.GROUPREF_EXISTS:
+            _group, yes, no = av
+            if not _is_line_local(yes, flags) or (no is not None and not _is_line_local(no, flags)):
+                return False
+        elif op is not c.GROUPREF:
+            # Lookarounds and anything else unexpected
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=64)
+def _line_scanner(regex: re.Pattern[str]) -> re.Pattern[str] | None:
+    """Return a MULTILINE variant of regex for whole-text search, if that is exact.
+
+    Returns None when the pattern could match across or look beyond a line
+    boundary, or is anchored to the line start, in which case callers should
+    search line by line.
+    """
+    if not _HAS_RE_INTERNALS:
+        return None
+    # The private re modules may also change shape without failing to import;
+    # any failure to parse or analyse the pattern intentionally falls back to
+    # the per-line search, which is always correct
+    try:
+        parsed = _re_parser.parse(regex.pattern, regex.flags)
+        if not _is_line_local(parsed, regex.flags):
+            return None
+        if len(parsed) and parsed[0] == (_re_constants.AT, _re_constants.AT_BEGINNING):
+            # re only tries position 0 for a leading ^, which makes per-line search
+            # cheaper than a MULTILINE scan that must test every position
+            return None
+    except Exception:  # noqa: BLE001
+        return None
+    return re.compile(regex.pattern, regex.flags | re.MULTILINE)
+
+
+def _search_text(regex: re.Pattern[str], content: str) -> list[tuple[int, str]]:
+    """Return (line_num, line) pairs for lines of content matching a compiled pattern.
+
+    Equivalent to ``_search_lines(regex, content.splitlines())``, but the whole
+    text is searched at once: literal patterns with ``str.find`` and other
+    line-local patterns with a single regex over the text. Only the lines
+    containing hits are sliced out, so content is never split into a per-line
+    list and lines without a hit are never visited individually. Patterns that
+    could span lines fall back to the per-line search.
+    """
+    # One substring scan per character is far cheaper than a character-class regex
+    if any(ch in content for ch in _OTHER_LINE_BREAKS):
+        return _search_lines(regex, content.splitlines())
+
+    literal = _literal_text(regex)
+    if literal and "\n" not in literal:
+
+        def locate(pos: int) -> int:
+            return content.find(literal, pos)
+
+    else:
+        scanner = _line_scanner(regex)
+        if scanner is None:
+            return _search_lines(regex, content.splitlines())
+
+        def locate(pos: int) -> int:
+            m = scanner.search(content, pos)
+            return -1 if m is None else m.start()
+
+    hits: list[tuple[int, str]] = []
+    size = len(content)
+    line_num = 1
+    line_start = 0
+    pos = locate(0)
+    while pos != -1:
+        line_num += content.count("\n", line_start, pos)
+        line_start = content.rfind("\n", line_start, pos) + 1
+        if line_start >= size:
+            # Empty match past the final newline, where splitlines() has no line
+            break
+        line_end = content.find("\n", pos)
+        if line_end == -1:
+            line_end = size
+        hits.append((line_num, content[line_start:line_end]))
+        # At most one hit per line: resume the search on the next line
+        if line_end >= size:
+            break
+        if len(hits) >= _DENSE_HITS_MIN and len(hits) * _DENSE_HITS_RATIO > line_num:
+            # Most lines match, so per-line checks are cheaper than locating each hit
+            hits.extend(_search_lines(regex, content[line_end + 1 :].splitlines(), line_num + 1))
+            break
+        pos = locate(line_end + 1)
+    return hits
+
+
+def _required_literal(regex: re.Pattern[str]) -> str | None:
+    r"""Return the longest literal substring that every match must contain.
+
+    Only literal runs at the top level of the pattern are considered, which is
+    enough for common patterns such as ``error.*\d+`` -> ``"error"``. Returns
+    None when no such substring is found or the pattern ignores case.
+    """
+    if not _HAS_RE_INTERNALS or regex.flags & re.IGNORECASE:
+        return None
+    # As in _line_scanner, the private re modules may change shape, so any
+    # failure means "no prefilter" rather than an error
+    try:
+        parsed = _re_parser.parse(regex.pattern, regex.flags)
+        best = ""
+        run: list[str] = []
+        for op, av in [*parsed, (None, None)]:
+            if op is _re_constants.LITERAL:
+                run.append(chr(av))
+                continue
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+    except Exception:  # noqa: BLE001
+        return None
+    return best or None
+
+
 def _grep_search_files(
     files: dict[str, Any],
     pattern: str,
@@ -365,15 +607,14 @@ def _grep_search_files(
     filtered = {fp: fd for fp, fd in files.items() if fp.startswith(normalized_path)}
 
     if glob:
-        filtered = {fp: fd for fp, fd in filtered.items() if wcglob.globmatch(Path(fp).name, glob, flags=wcglob.BRACE)}
+        glob_matcher = wcglob.compile(glob, flags=wcglob.BRACE)
+        filtered = {fp: fd for fp, fd in filtered.items() if glob_matcher.match(Path(fp).name)}
 
     results: dict[str, list[tuple[int, str]]] = {}
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
-            if regex.search(line):
-                if file_path not in results:
-                    results[file_path] = []
-                results[file_path].append((line_num, line))
+        hits = _search_lines(regex, file_data["content"])
+        if hits:
+            results[file_path] = hits
 
     if not results:
         return "No matches found"
@@ -408,13 +649,12 @@ def grep_matches_from_files(
     filtered = {fp: fd for fp, fd in files.items() if fp.startswith(normalized_path)}
 
     if glob:
-        filtered = {fp: fd for fp, fd in filtered.items() if wcglob.globmatch(Path(fp).name, glob, flags=wcglob.BRACE)}
+        glob_matcher = wcglob.compile(glob, flags=wcglob.BRACE)
+        filtered = {fp: fd for fp, fd in filtered.items() if glob_matcher.match(Path(fp).name)}
 
     matches: list[GrepMatch] = []
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
-            if regex.search(line):
-                matches.append({"path": file_path, "line": int(line_num), "text": line})
+        matches.extend({"path": file_path, "line": line_num, "text": line} for line_num, line in _search_lines(regex, file_data["content"]))
     return matches
 
 
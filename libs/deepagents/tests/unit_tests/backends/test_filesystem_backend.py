@@ -1,6 +1,10 @@
+import subprocess
+import sys
 from pathlib import Path
 
-from deepagents.backends.filesystem import FilesystemBackend
+import pytest
+
+from deepagents.backends.filesystem import _STREAM_READ_MIN_BYTES, FilesystemBackend
 from deepagents.backends.protocol import EditResult, WriteResult
 
 
@@ -9,6 +13,12 @@ def write_file(p: Path, content: str):
     p.write_text(content)
 
 
+@pytest.fixture
+def python_grep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Route grep through the Python fallback even where rg is installed."""
+    monkeypatch.setattr(FilesystemBackend, "_ripgrep_search", lambda *_args: None)
+
+
 def test_filesystem_backend_normal_mode(tmp_path: Path):
     root = tmp_path
     f1 = root / "a.txt"
@@ -89,6 +99,183 @@ def test_filesystem_backend_virtual_mode(tmp_path: Path):
         pass
 
 
+@pytest.mark.usefixtures("python_grep")
+def test_filesystem_backend_grep_regex_across_files(tmp_path: Path):
+    root = tmp_path
+    write_file(root / "app.log", "ok\nerror code 42\nerror without number")
+    write_file(root / "other.log", "all good\nnothing here")
+    write_file(root / "nested" / "deep.log", "warn\nerror 7")
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+
+    matches = be.grep_raw(r"error.*\d+", path="/")
+    assert isinstance(matches, list)
+    assert sorted((m["path"], m["line"]) for m in matches) == [("/app.log", 2), ("/nested/deep.log", 2)]
+
+    # Case-insensitive and alternation patterns still match normally
+    assert {m["path"] for m in be.grep_raw("(?i)ALL GOOD", path="/")} == {"/other.log"}
+    assert {m["path"] for m in be.grep_raw("warn|nothing", path="/")} == {"/nested/deep.log", "/other.log"}
+
+    # Anchors, boundaries and classes that could span lines keep per-line semantics
+    write_file(root / "edges.txt", "alpha\n\nbeta gamma\n  \ngamma\n")
+    for pattern, lines in [(r"a$", [1, 3, 5]), (r"\bgamma", [3, 5]), (r"^$", [2]), (r"\s+$", [4]), (r"a\s+g", [3])]:
+        found = be.grep_raw(pattern, path="/", glob="edges.txt")
+        assert isinstance(found, list)
+        assert [m["line"] for m in found] == lines, pattern
+
+
+def test_filesystem_backend_read_offset_and_limit(tmp_path: Path):
+    root = tmp_path
+    write_file(root / "big.txt", "".join(f"line {i}\n" for i in range(1, 10001)))
+    write_file(root / "blank.txt", "\n   \n\t\n")
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+
+    window = be.read("/big.txt", offset=4998, limit=3)
+    assert [row.split("\t")[1] for row in window.splitlines()] == ["line 4999", "line 5000", "line 5001"]
+    assert window.splitlines()[0].strip().startswith("4999")
+
+    assert be.read("/big.txt", offset=10000) == "Error: Line offset 10000 exceeds file length (10000 lines)"
+    assert "empty contents" in be.read("/blank.txt")
+
+
+@pytest.mark.skipif(not Path("/proc/self/status").is_file(), reason="requires procfs")
+def test_filesystem_backend_read_zero_size_file_with_content():
+    # procfs files report st_size == 0 but still have content to read
+    assert Path("/proc/self/status").stat().st_size == 0
+
+    be = FilesystemBackend(virtual_mode=False)
+    txt = be.read("/proc/self/status", offset=0, limit=2)
+    assert txt.splitlines()[0].split("\t")[1] == "Name:"
+    assert len(txt.splitlines()) == 2
+
+
+@pytest.mark.skipif(not Path("/proc/sys/kernel/ostype").is_file(), reason="requires procfs")
+@pytest.mark.usefixtures("python_grep")
+def test_filesystem_backend_grep_zero_size_file_with_content():
+    be = FilesystemBackend(virtual_mode=False)
+    matches = be.grep_raw("Linux", path="/proc/sys/kernel/ostype", glob="ostype")
+    assert matches == [{"path": "/proc/sys/kernel/ostype", "line": 1, "text": "Linux"}]
+
+
+@pytest.mark.usefixtures("python_grep")
+def test_filesystem_backend_grep_falls_back_when_pattern_analysis_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from deepagents.backends import utils
+
+    def boom(*_args: object) -> bool:
+        raise AttributeError
+
+    monkeypatch.setattr(utils, "_is_line_local", boom)
+    root = tmp_path
+    write_file(root / "a.txt", "alpha\nbeta 42\ngamma\n")
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+    matches = be.grep_raw(r"beta \d{2}", path="/")
+    assert isinstance(matches, list)
+    assert [(m["line"], m["text"]) for m in matches] == [(2, "beta 42")]
+
+
+@pytest.mark.usefixtures("python_grep")
+def test_filesystem_backend_grep_without_literal_prefilter(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from deepagents.backends import utils
+
+    # Simulate a Python whose private re parser no longer has the expected API
+    monkeypatch.setattr(utils, "_re_parser", object())
+    root = tmp_path
+    write_file(root / "a.txt", "alpha\nerror code 7\ngamma\n")
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+    matches = be.grep_raw(r"error code \d", path="/")
+    assert isinstance(matches, list)
+    assert [(m["line"], m["text"]) for m in matches] == [(2, "error code 7")]
+
+
+def test_filesystem_backend_grep_without_re_internals(tmp_path: Path):
+    # A Python whose private re modules cannot be imported must still load the
+    # backends and grep through the per-line search
+    script = """
+import sys
+sys.modules["re._parser"] = None
+from deepagents.backends import utils
+from deepagents.backends.filesystem import FilesystemBackend
+FilesystemBackend._ripgrep_search = lambda *args: None
+assert not utils._HAS_RE_INTERNALS
+matches = FilesystemBackend(root_dir=sys.argv[1], virtual_mode=True).grep_raw(r"error \\d+", path="/")
+print([(m["line"], m["text"]) for m in matches])
+"""
+    write_file(tmp_path / "a.txt", "alpha\nerror 42\n")
+    proc = subprocess.run([sys.executable, "-c", script, str(tmp_path)], capture_output=True, text=True, check=True)  # noqa: S603
+    assert proc.stdout.strip() == "[(2, 'error 42')]"
+
+
+def test_filesystem_backend_read_invalid_utf8_after_window(tmp_path: Path):
+    root = tmp_path
+    body = "".join(f"line {i}\n" for i in range(1, 60001)).encode()
+    # Large files are streamed only up to the requested window
+    assert len(body) > _STREAM_READ_MIN_BYTES
+    (root / "bad_tail.txt").write_bytes(body + b"\xff\n")
+    # Smaller files are decoded whole, as before
+    (root / "small_bad_tail.txt").write_bytes(b"line 1\nline 2\nline 3\n\xff\n")
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+
+    # Bytes after the requested window of a large file are never decoded
+    head = be.read("/bad_tail.txt", offset=0, limit=2)
+    assert [row.split("\t")[1] for row in head.splitlines()] == ["line 1", "line 2"]
+
+    # A window that reaches the bad byte still reports the decode error
+    tail = be.read("/bad_tail.txt", offset=59999, limit=5)
+    assert tail.startswith("Error reading file '/bad_tail.txt'")
+    assert "can't decode byte 0xff" in tail
+
+    small = be.read("/small_bad_tail.txt", offset=0, limit=2)
+    assert small.startswith("Error reading file '/small_bad_tail.txt'")
+    assert "can't decode byte 0xff" in small
+
+
+def test_filesystem_backend_ripgrep_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cmds: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_kwargs: object) -> subprocess.CompletedProcess[bytes]:
+        cmds.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, max_file_size_mb=2)
+
+    assert be.grep_raw("needle", path="/") == []
+    assert be.grep_raw(r"needle\d+", path="/") == []
+
+    literal_cmd, regex_cmd = cmds
+    assert "--fixed-strings" in literal_cmd
+    assert "--fixed-strings" not in regex_cmd
+    for cmd in cmds:
+        assert cmd[cmd.index("--max-filesize") + 1] == str(2 * 1024 * 1024)
+
+
+@pytest.mark.usefixtures("python_grep")
+def test_filesystem_backend_glob_and_grep_walk_nested_and_hidden(tmp_path: Path):
+    root = tmp_path
+    write_file(root / "top.py", "target")
+    write_file(root / ".hidden.py", "target")
+    write_file(root / "pkg" / "mod.py", "target")
+    write_file(root / "pkg" / ".cache" / "gen.py", "target")
+    write_file(root / "pkg" / "notes.txt", "target")
+    (root / "link").symlink_to(root / "pkg", target_is_directory=True)
+
+    be = FilesystemBackend(root_dir=str(root), virtual_mode=True)
+
+    # Filename patterns match at any depth, include dotfiles, and do not descend into symlinked dirs
+    expected = ["/.hidden.py", "/pkg/.cache/gen.py", "/pkg/mod.py", "/top.py"]
+    assert [fi["path"] for fi in be.glob_info("*.py", path="/")] == expected
+    assert [fi["path"] for fi in be.glob_info("[mt]*.py", path="/pkg")] == ["/pkg/mod.py"]
+
+    # grep's include glob is matched against file names only
+    matches = be.grep_raw("target", path="/", glob="{mod,gen}.py")
+    assert isinstance(matches, list)
+    assert sorted(m["path"] for m in matches) == ["/pkg/.cache/gen.py", "/pkg/mod.py"]
+
+
 def test_filesystem_backend_ls_nested_directories(tmp_path: Path):
     root = tmp_path
 
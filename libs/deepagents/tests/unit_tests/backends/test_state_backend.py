@@ -75,6 +75,21 @@ def test_state_backend_errors():
     assert isinstance(dup_err, WriteResult) and dup_err.error and "already exists" in dup_err.error
 
 
+def test_state_backend_grep_literal_and_regex_patterns():
+    rt = make_runtime()
+    be = StateBackend(rt)
+
+    res = be.write("/code.py", "a.c = 1\nabc = 2\nx-y = 3")
+    rt.state["files"].update(res.files_update)
+
+    # Metacharacters keep their regex meaning
+    assert [m["line"] for m in be.grep_raw("a.c", path="/")] == [1, 2]
+    assert [m["line"] for m in be.grep_raw("a\\.c", path="/")] == [1]
+    # Plain text is matched literally
+    assert [m["line"] for m in be.grep_raw("x-y", path="/")] == [3]
+    assert be.grep_raw("missing", path="/") == []
+
+
 def test_state_backend_ls_nested_directories():
     rt = make_runtime()
     be = StateBackend(rt)